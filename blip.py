@@ -30,7 +30,9 @@ Menu (early-90s style, no CLI flags)
   D)    (Windows only) Toggle driver: winsound-file <-> winsound-mem
 """
 
-import io
+import atexit
+import functools
+import hashlib
 import math
 import os
 import platform
@@ -42,9 +44,13 @@ import subprocess
 import sys
 import tempfile
 import time
-import wave
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from itertools import accumulate, repeat
+from operator import add, mul
+from typing import Iterator, List, Tuple, Optional
 
 IS_WINDOWS = (platform.system() == "Windows")
 IS_MAC = (platform.system() == "Darwin")
@@ -58,6 +64,7 @@ DEFAULT_SR = 44100
 DEFAULT_AMP = 0.24  # safe-but-audible
 DEFAULT_CPS = 26.0  # slower default
 DEFAULT_PUNCT_MULT = 2.2
+WAV_CACHE_FILES = 32  # temp WAVs kept on disk for replaying identical lines
 
 BANNER = r"""
 ===============================================================
@@ -91,115 +98,156 @@ def hann_env(n: int, total: int) -> float:
     u = n / (total - 1)
     return 0.5 * (1.0 - math.cos(2.0 * math.pi * u))
 
-def clamp(x: float, lo=-1.0, hi=1.0) -> float:
-    return lo if x < lo else hi if x > hi else x
+@functools.lru_cache(maxsize=32)
+def hann_window(total: int) -> Tuple[float, ...]:
+    """Whole Hann window; grain lengths repeat, so each is computed once."""
+    return tuple(hann_env(i, total) for i in range(total))
+
+# Sine lookup table for plain tones, read with a 32-bit fixed-point phase
+SIN_TABLE_BITS = 12
+_SIN_TABLE = tuple(math.sin(2.0 * math.pi * i / (1 << SIN_TABLE_BITS)) for i in range(1 << SIN_TABLE_BITS))
+
+def table_sine(freq: float, n: int, sr: int, amp: float = 1.0) -> List[float]:
+    """n samples of a steady sine via table lookup (~-56 dB error, no math.sin per sample)."""
+    step = int(freq * (1 << 32) / sr)
+    shift, mask = 32 - SIN_TABLE_BITS, (1 << SIN_TABLE_BITS) - 1
+    return [_SIN_TABLE[(ph >> shift) & mask] * amp for ph in range(0, step * n, step)]
 
 def pcm16_bytes(samples: List[float]) -> bytes:
-    b = bytearray()
-    for s in samples:
-        b += struct.pack("<h", int(clamp(s) * 32767))
-    return bytes(b)
-
-def wav_bytes(samples: List[float], sr: int) -> bytes:
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sr)
-        wf.writeframes(pcm16_bytes(samples))
-    return buf.getvalue()
+    # Clip to [-1, 1] inline: a per-sample clamp() call costs more than the conversion
+    pcm = array("h", [int((-1.0 if s < -1.0 else 1.0 if s > 1.0 else s) * 32767) for s in samples])
+    if sys.byteorder == "big": pcm.byteswap()  # WAV data is little-endian
+    return pcm.tobytes()
+
+# Mono 16-bit PCM is the only format we emit, so the RIFF layout is fixed
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+def wav_bytes_from_pcm(pcm: bytes, sr: int) -> bytearray:
+    # Sized once up front: header packed in place, PCM copied in right behind it
+    out = bytearray(_WAV_HEADER.size + len(pcm))
+    _WAV_HEADER.pack_into(out, 0, b"RIFF", 36 + len(pcm), b"WAVE", b"fmt ", 16, 1, 1,
+                          sr, sr * 2, 2, 16, b"data", len(pcm))
+    memoryview(out)[_WAV_HEADER.size:] = pcm
+    return out
+
+def write_wav(path: str, pcm: bytes, sr: int):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0))
+    try:
+        os.write(fd, wav_bytes_from_pcm(pcm, sr))
+    finally:
+        os.close(fd)
 
 def limit_peak(samples: List[float], limit_peak: float = 0.98, dc_block: bool = True) -> List[float]:
     if not samples: return samples
-    if dc_block:
-        m = sum(samples) / len(samples)
-        samples = [s - m for s in samples]
-    peak = max(1e-12, max(abs(s) for s in samples))
-    if peak > limit_peak:
-        scale = limit_peak / peak
-        samples = [s * scale for s in samples]
-    return samples
+    m = sum(samples) / len(samples) if dc_block else 0.0
+    # Peak after DC removal follows from the raw extremes, so the
+    # subtract and the scale below share a single output pass
+    peak = max(1e-12, max(samples) - m, m - min(samples))
+    scale = limit_peak / peak if peak > limit_peak else 1.0
+    if scale == 1.0:
+        return [s - m for s in samples] if dc_block else samples
+    return [(s - m) * scale for s in samples]
+
+def limited_pcm16_bytes(samples: List[int], limit_peak: float = 0.95) -> bytes:
+    """
+    DC block + peak limit + PCM16 in a single pass. `samples` are in int16
+    units (an integer mix of int16 grains); `limit_peak` is full-scale relative.
+    """
+    if not samples: return b""
+    limit = limit_peak * 32767
+    m = sum(samples) / len(samples)
+    peak = max(1e-12, max(samples) - m, m - min(samples))
+    scale = limit / peak if peak > limit else 1.0
+    # The limited signal stays within +-limit (<= 32767), so no clamp is needed
+    pcm = array("h", [int((s - m) * scale) for s in samples])
+    if sys.byteorder == "big": pcm.byteswap()
+    return pcm.tobytes()
 
 # ======================
 # Grains (short blips)
 # ======================
 
+def enveloped(v: List[float], amp: float) -> List[float]:
+    """v * Hann * amp; map/operator keep the per-sample loop in C."""
+    n = len(v)
+    return list(map(mul, map(mul, v, hann_window(n)), repeat(amp, n)))
+
+def _shape(waveform: str, duty: float, phases: List[float]) -> List[float]:
+    # Resolve the waveform once, not per sample
+    inv_tau = 1.0 / (2.0 * math.pi)
+    if waveform == "triangle":
+        return [2.0 * abs(2.0 * ((ph * inv_tau) % 1.0) - 1.0) - 1.0 for ph in phases]
+    if waveform == "saw":
+        return [2.0 * ((ph * inv_tau) % 1.0) - 1.0 for ph in phases]
+    if waveform == "pulse":
+        return [1.0 if ((ph * inv_tau) % 1.0) < duty else -1.0 for ph in phases]
+    return list(map(math.sin, phases))
+
 def synth_fixed(freq: float, dur_ms: float, waveform: str, duty: float,
                 vibrato_rate: float, vibrato_depth: float, amp: float, sr: int) -> List[float]:
     n = int(sr * (dur_ms / 1000.0))
-    out = [0.0] * n
-    phase = 0.0
-    for i in range(n):
-        t = i / sr
-        f = freq * (1.0 + vibrato_depth * math.sin(2.0 * math.pi * vibrato_rate * t)) if vibrato_rate > 0 else freq
-        phase += 2.0 * math.pi * f / sr
-        if phase > 1e9: phase -= 1e9
-        p = (phase / (2.0 * math.pi)) % 1.0
-        if waveform == "sine":
-            v = math.sin(phase)
-        elif waveform == "triangle":
-            v = 2.0 * abs(2.0 * p - 1.0) - 1.0
-        elif waveform == "saw":
-            v = 2.0 * p - 1.0
-        elif waveform == "pulse":
-            v = 1.0 if p < duty else -1.0
-        else:
-            v = math.sin(phase)
-        out[i] = v * hann_env(i, n) * amp
-    return out
+    w0 = 2.0 * math.pi * freq / sr
+    if vibrato_rate > 0:
+        # Per-sample phase increments, integrated in one C-level pass
+        wv = 2.0 * math.pi * vibrato_rate / sr
+        incs = [w0 * (1.0 + vibrato_depth * math.sin(wv * i)) for i in range(n)]
+        v = _shape(waveform, duty, list(accumulate(incs)))
+    else:
+        v = _shape(waveform, duty, list(accumulate([w0] * n)))
+    return enveloped(v, amp)
 
 def synth_sweep(f0: float, f1: float, dur_ms: float, waveform: str, amp: float, sr: int) -> List[float]:
     n = int(sr * (dur_ms / 1000.0))
-    out = [0.0] * n
-    phase = 0.0
-    for i in range(n):
-        u = i / max(1, n - 1)
-        f = f0 + (f1 - f0) * u
-        phase += 2.0 * math.pi * f / sr
-        p = (phase / (2.0 * math.pi)) % 1.0
-        if waveform == "sine":
-            v = math.sin(phase)
-        elif waveform == "triangle":
-            v = 2.0 * abs(2.0 * p - 1.0) - 1.0
-        elif waveform == "saw":
-            v = 2.0 * p - 1.0
-        else:
-            v = math.sin(phase)
-        out[i] = v * hann_env(i, n) * amp
-    return out
+    k = 2.0 * math.pi / sr
+    slope = (f1 - f0) / max(1, n - 1)
+    phases = list(accumulate([k * (f0 + slope * i) for i in range(n)]))
+    # Sweeps have no pulse shape; anything but triangle/saw is a sine
+    return enveloped(_shape(waveform if waveform in ("triangle", "saw") else "sine", 0.0, phases), amp)
 
 def synth_noise(dur_ms: float, lowpass_alpha: float, amp: float, sr: int) -> List[float]:
     n = int(sr * (dur_ms / 1000.0))
-    out = [0.0] * n
-    y = 0.0
-    for i in range(n):
-        x = (random.random() * 2.0 - 1.0)
-        y = lowpass_alpha * x + (1.0 - lowpass_alpha) * y
-        out[i] = y * hann_env(i, n) * amp
-    return out
+    a, b = lowpass_alpha, 1.0 - lowpass_alpha
+    x = [random.random() * 2.0 - 1.0 for _ in range(n)]
+    # One-pole lowpass is recursive; accumulate carries the state in C
+    y = list(accumulate(x, lambda yp, xi: a * xi + b * yp, initial=0.0))[1:]
+    return enveloped(y, amp)
 
 def synth_fm(car_freq: float, mod_ratio: float, index: float,
              dur_ms: float, amp: float, sr: int) -> List[float]:
     """Simple 2-operator FM (Genesis-like flavor)"""
     n = int(sr * (dur_ms / 1000.0))
-    out = [0.0] * n
-    for i in range(n):
-        t = i / sr
-        mod = math.sin(2.0 * math.pi * (car_freq * mod_ratio) * t)
-        v = math.sin(2.0 * math.pi * car_freq * t + index * mod)
-        out[i] = v * hann_env(i, n) * amp
-    return out
+    wc = 2.0 * math.pi * car_freq / sr
+    wm = wc * mod_ratio
+    mod = map(math.sin, [wm * i for i in range(n)])
+    v = list(map(math.sin, [wc * i + index * m for i, m in zip(range(n), mod)]))
+    return enveloped(v, amp)
 
-@dataclass
+@dataclass(eq=False)  # identity hash, so a Variation can key render caches
 class Variation:
     name: str
-    grain: List[float]
     dur_ms: float
-
-def build_variations(amp: float, sr: int) -> List[Variation]:
-    V: List[Variation] = []
+    pool: array   # int16 samples of every grain in the bank, back to back
+    offset: int
+    length: int
+
+    @property
+    def grain(self) -> memoryview:
+        """Zero-copy view of this variation's samples in the shared pool."""
+        return memoryview(self.pool)[self.offset:self.offset + self.length]
+
+    @functools.cached_property
+    def mix_source(self) -> List[int]:
+        """The grain as a list, built once and reused by every line rendered with it."""
+        return self.grain.tolist()
+
+@functools.lru_cache(maxsize=4)
+def unit_grains(sr: int) -> Tuple[Tuple[str, float, array, float], ...]:
+    """(name, ms, grain, peak) for every variation at amp=1.0, DC-blocked but not limited."""
+    G = []
+    amp = 1.0  # recipes are linear in amp; build_variations applies the real one
     def mk(samples: List[float], name: str, ms: float):
-        V.append(Variation(name=name, grain=limit_peak(samples), dur_ms=ms))
+        g = limit_peak(samples, limit_peak=math.inf)
+        G.append((name, ms, array("d", g), max(1e-12, max(map(abs, g)))))
 
     # --- Original 10 baseline timbres ---
     mk(synth_fixed(820, 55, "pulse", 0.25, 0.0, 0.0, amp, sr), "pulse25_mid", 55)
@@ -232,37 +280,60 @@ def build_variations(amp: float, sr: int) -> List[Variation]:
     mk(synth_fm(600, 2.0, 1.2, 55, amp, sr),                              "ps4_gen_fm", 55)        # Phantasy Star IV (Genesis FM-ish)
     mk(synth_fixed(760, 36, "pulse", 0.25, 14.0, 0.05, amp, sr),          "ut_default_blip", 36)   # Undertale (tight vibrato)
 
+    return tuple(G)
+
+def build_variations(amp: float, sr: int) -> List[Variation]:
+    V: List[Variation] = []
+    pool = array("h")
+    for name, ms, g, peak in unit_grains(sr):
+        # Same result as limit_peak() on a grain synthesized at `amp`, stored as int16
+        scale = (amp if amp * peak <= 0.98 else 0.98 / peak) * 32767
+        V.append(Variation(name=name, dur_ms=ms, pool=pool, offset=len(pool), length=len(g)))
+        pool.extend([int(s * scale) for s in g])
     return V
 
 # ======================
 # Schedule & render one line buffer
 # ======================
 
+def char_offsets(text: str, cps: float, punct_mult: float) -> List[float]:
+    """Start time (s) of every character slot, plus the end of the last one."""
+    step = 1.0 / max(1.0, cps)
+    return list(accumulate((step * (punct_mult if ch in PUNCT else 1.0) for ch in text), initial=0.0))
+
 def schedule_beeps_for_line(text: str, cps: float, punct_mult: float,
                             include_whitespace: bool, grain_len: int, sr: int) -> Tuple[List[int], int]:
-    starts: List[int] = []
-    t = 0.0
-    step = 1.0 / max(1.0, cps)
-    for ch in text:
-        if ch.strip() or include_whitespace:
-            starts.append(int(t * sr))
-        t += step * (punct_mult if ch in PUNCT else 1.0)
-    total_sec = t + (grain_len / sr) + 0.12
+    times = char_offsets(text, cps, punct_mult)
+    starts = [int(t * sr) for ch, t in zip(text, times) if include_whitespace or ch.strip()]
+    total_sec = times[-1] + (grain_len / sr) + 0.12
     return starts, int(total_sec * sr) + 1
 
-def render_line_audio(text: str, var: Variation, sr: int, cps: float,
-                      punct_mult: float, include_whitespace: bool) -> List[float]:
-    grain = var.grain
+def mix_line(text: str, var: Variation, sr: int, cps: float,
+             punct_mult: float, include_whitespace: bool) -> List[int]:
+    """
+    Grains stamped at their scheduled starts, before DC block / limiting.
+    Integer mix in int16 units; Python ints cannot overflow on overlaps.
+    """
+    grain = var.mix_source
     glen = len(grain)
     starts, total_len = schedule_beeps_for_line(text, cps, punct_mult, include_whitespace, glen, sr)
-    buf = [0.0] * total_len
+    buf = [0] * total_len  # per call, so rendering stays reentrant across threads
+    end = 0  # starts are ascending; everything at/after `end` is still silent
     for s0 in starts:
         j_end = min(total_len, s0 + glen)
-        j = s0; i = 0
-        while j < j_end:
-            buf[j] += grain[i]
-            j += 1; i += 1
-    return limit_peak(buf, limit_peak=0.95, dc_block=True)
+        if s0 >= end:
+            buf[s0:j_end] = grain[:j_end - s0]
+        else:
+            buf[s0:j_end] = map(add, buf[s0:j_end], grain)
+        end = max(end, j_end)
+    return buf
+
+@functools.lru_cache(maxsize=64)
+def render_line_pcm(text: str, var: Variation, sr: int, cps: float,
+                    punct_mult: float, include_whitespace: bool) -> bytes:
+    """PCM16 bytes for one line; memoized since lines are replayed per variation."""
+    buf = mix_line(text, var, sr, cps, punct_mult, include_whitespace)
+    return limited_pcm16_bytes(buf, limit_peak=0.95)
 
 # ======================
 # Player (Windows uses winsound file by default)
@@ -273,12 +344,15 @@ class Player:
     Windows default: 'winsound-file' (temp WAV per line with SND_FILENAME|SND_ASYNC).
     Windows optional: 'winsound-mem'  (in-memory SND_MEMORY|SND_ASYNC).
     POSIX: afplay/paplay/aplay via subprocess.
+    File modes keep the last WAV_CACHE_FILES temp WAVs, keyed by content, so a
+    replayed line is not written again.
     """
     def __init__(self):
         self.mode, self.cmd = self._detect()
         self._last_proc: Optional[subprocess.Popen] = None
-        self._hold_bytes: Optional[bytes] = None
+        self._hold_bytes: Optional[bytearray] = None
         self._last_path: Optional[str] = None
+        self._wav_files: "OrderedDict[str, None]" = OrderedDict()
 
     def _detect(self) -> Tuple[str, List[str]]:
         if IS_WINDOWS:
@@ -310,16 +384,13 @@ class Player:
                 except Exception: pass
         self._last_proc = None
 
-        # Purge winsound & remove temp file if used
+        # Purge winsound; temp WAVs stay in the cache until clear_wav_cache()
         if IS_WINDOWS:
             try:
                 import winsound
                 winsound.PlaySound(None, winsound.SND_PURGE)
             except Exception:
                 pass
-            if self._last_path and os.path.exists(self._last_path):
-                try: os.remove(self._last_path)
-                except Exception: pass
             self._last_path = None
             self._hold_bytes = None
         else:
@@ -335,18 +406,42 @@ class Player:
                     if shutil.which("killall"):
                         try: subprocess.run(["killall", "-q", nm], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                         except Exception: pass
+        self.clear_wav_cache()
+
+    def clear_wav_cache(self):
+        """Delete every cached temp WAV."""
+        for path in self._wav_files:
+            try: os.remove(path)
+            except Exception: pass
+        self._wav_files.clear()
+        self._last_path = None
+
+    def _wav_file(self, pcm: bytes, sr: int, tmpdir: str) -> str:
+        """Temp WAV holding this PCM; reused as-is when the same line plays again."""
+        key = hashlib.blake2b(pcm, digest_size=8).hexdigest()
+        path = os.path.join(tmpdir, f"line_{os.getpid()}_{sr}_{key}.wav")
+        if path in self._wav_files and os.path.exists(path):
+            self._wav_files.move_to_end(path)
+            return path
+        write_wav(path, pcm, sr)
+        self._wav_files[path] = None
+        while len(self._wav_files) > WAV_CACHE_FILES:
+            old, _ = self._wav_files.popitem(last=False)
+            try: os.remove(old)
+            except Exception: pass
+        return path
 
     def play_line_async(self, samples: List[float], sr: int, tmpdir: str) -> float:
         """Start playback of rendered line; return approx duration (seconds)."""
-        duration = len(samples) / float(sr)
+        return self.play_pcm_async(pcm16_bytes(samples), sr, tmpdir)
+
+    def play_pcm_async(self, pcm: bytes, sr: int, tmpdir: str) -> float:
+        """Same as play_line_async, for a line already encoded as PCM16."""
+        duration = len(pcm) / (2.0 * sr)
         if self.mode == "winsound-file":
             try:
                 import winsound
-                # Write one temp WAV per line
-                path = os.path.join(tmpdir, f"line_{int(time.time()*1000)}.wav")
-                with wave.open(path, "wb") as wf:
-                    wf.setnchannels(1); wf.setsampwidth(2); wf.setframerate(sr)
-                    wf.writeframes(pcm16_bytes(samples))
+                path = self._wav_file(pcm, sr, tmpdir)
                 self._last_path = path
                 winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
             except Exception:
@@ -354,16 +449,13 @@ class Player:
         elif self.mode == "winsound-mem":
             try:
                 import winsound
-                data = wav_bytes(samples, sr)
+                data = wav_bytes_from_pcm(pcm, sr)
                 self._hold_bytes = data
                 winsound.PlaySound(data, winsound.SND_MEMORY | winsound.SND_ASYNC)
             except Exception:
                 pass
         elif self.mode in ("afplay", "paplay", "aplay"):
-            path = os.path.join(tmpdir, f"line_{int(time.time()*1000)}.wav")
-            with wave.open(path, "wb") as wf:
-                wf.setnchannels(1); wf.setsampwidth(2); wf.setframerate(sr)
-                wf.writeframes(pcm16_bytes(samples))
+            path = self._wav_file(pcm, sr, tmpdir)
             try:
                 self._last_proc = subprocess.Popen(self.cmd + [path],
                                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -375,13 +467,9 @@ class Player:
         return duration
 
     def wait_done(self, timeout: float):
-        # winsound has no join; sleep for duration; then tidy up
+        # winsound has no join; sleep for duration. Temp WAVs stay cached.
         if self.mode.startswith("winsound"):
             time.sleep(max(0.0, timeout))
-            # Cleanup file if used
-            if self._last_path and os.path.exists(self._last_path):
-                try: os.remove(self._last_path)
-                except Exception: pass
             self._last_path = None
             self._hold_bytes = None
             return
@@ -390,16 +478,12 @@ class Player:
                 self._last_proc.wait(timeout=timeout)
             except subprocess.TimeoutExpired:
                 pass
-            # Cleanup temp file after process ends
-            if self._last_path and os.path.exists(self._last_path):
-                try: os.remove(self._last_path)
-                except Exception: pass
             self._last_path = None
 
     def beep_verify(self, sr: int = 44100):
         """Play a 440 Hz 300 ms test tone to verify audio path."""
         n = int(sr * 0.300)
-        tone = [math.sin(2*math.pi*440*i/sr)*0.3 for i in range(n)]
+        tone = table_sine(440, n, sr, 0.3)
         self.play_line_async(limit_peak(tone), sr, tempfile.gettempdir())
         self.wait_done(0.35)
 
@@ -411,18 +495,12 @@ class Player:
 # ======================
 
 def print_line_synced(text: str, cps: float, punct_mult: float):
-    step = 1.0 / max(1.0, cps)
+    due = char_offsets(text, cps, punct_mult)  # same schedule as the audio
     t0 = time.monotonic()
-    t = 0.0
-    for ch in text:
-        target = t0 + t
-        while True:
-            now = time.monotonic()
-            dt = target - now
-            if dt <= 0: break
-            time.sleep(0.001 if dt < 0.01 else 0.01)
+    for ch, t in zip(text, due):
+        dt = t0 + t - time.monotonic()
+        if dt > 0: time.sleep(dt)
         sys.stdout.write(ch); sys.stdout.flush()
-        t += step * (punct_mult if ch in PUNCT else 1.0)
     if not text.endswith("\n"):
         print("")
 
@@ -465,25 +543,45 @@ def settle_device(player: Player, sr: int, ms: int):
     player.play_line_async(silence, sr, tempfile.gettempdir())
     player.wait_done((ms/1000.0) + 0.05)
 
-def play_line(text: str, var: Variation, cfg: Config, player: Player, tmpdir: str):
-    samples = render_line_audio(text, var, cfg.sr, cfg.cps, cfg.punct_mult, cfg.include_whitespace)
-    duration = player.play_line_async(samples, cfg.sr, tmpdir)
+def play_line(text: str, var: Variation, cfg: Config, player: Player, tmpdir: str,
+              pcm: Optional[bytes] = None):
+    if pcm is None:
+        pcm = render_line_pcm(text, var, cfg.sr, cfg.cps, cfg.punct_mult, cfg.include_whitespace)
+    duration = player.play_pcm_async(pcm, cfg.sr, tmpdir)
     print_line_synced(text, cfg.cps, cfg.punct_mult)
     player.wait_done(duration + 0.05)
     settle_device(player, cfg.sr, cfg.silence_flush_ms)
     if cfg.post_gap > 0: time.sleep(cfg.post_gap)
 
-def play_variation(v: Variation, cfg: Config, player: Player, tmpdir: str):
+def play_variation(v: Variation, cfg: Config, player: Player, tmpdir: str,
+                   pcms: Optional[Iterator[bytes]] = None):
     header = f"=== {v.name}  ({int(v.dur_ms)} ms) ==="
     print(header); print("-" * len(header))
     for line in cfg.texts:
-        play_line(line, v, cfg, player, tmpdir)
+        play_line(line, v, cfg, player, tmpdir, next(pcms) if pcms else None)
     print()
 
+def prefetch_line_pcm(pool: ThreadPoolExecutor, lines: List[Tuple[str, Variation]],
+                      cfg: Config) -> Iterator[bytes]:
+    """Yield each line's PCM while the following line renders on the pool."""
+    def submit(i: int):
+        text, var = lines[i]
+        return pool.submit(render_line_pcm, text, var, cfg.sr, cfg.cps,
+                           cfg.punct_mult, cfg.include_whitespace)
+    nxt = submit(0) if lines else None
+    for i in range(len(lines)):
+        cur = nxt
+        nxt = submit(i + 1) if i + 1 < len(lines) else None
+        yield cur.result()
+
 def play_all(vars: List[Variation], cfg: Config, player: Player, tmpdir: str):
     print(f"[Playing ALL | driver={player.label()} | sr={cfg.sr} | amp={cfg.amp:.2f}]")
-    for v in vars:
-        play_variation(v, cfg, player, tmpdir)
+    lines = [(line, v) for v in vars for line in cfg.texts]
+    # One render worker: line N+1 is rendered while line N plays
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pcms = prefetch_line_pcm(pool, lines, cfg)
+        for v in vars:
+            play_variation(v, cfg, player, tmpdir, pcms)
 
 def edit_lines() -> List[str]:
     print("\nEnter text lines (blank line to finish):")
@@ -518,6 +616,7 @@ def main():
     )
 
     player = Player()
+    atexit.register(player.clear_wav_cache)
     with tempfile.TemporaryDirectory(prefix="text_blip_sched_") as td:
         variations = build_variations(cfg.amp, cfg.sr)
         # Initial verify + settle
@@ -1,127 +1,164 @@
 #!/usr/bin/env python3
 # BLIP — ultra‑minified, menu + per‑variation exporter (PY/WAV)
 
-import io,math,os,platform,random,shutil,struct,subprocess,sys,tempfile,time,wave
+import atexit,cmath,math,os,platform,queue,random,shutil,struct,subprocess,sys,tempfile,threading,time
+from array import array
+from functools import lru_cache
+from itertools import accumulate,repeat
+from operator import add,mul
 WIN=platform.system()=="Windows"; MAC=platform.system()=="Darwin"; PUNCT=set(".!?;:")
 
 # ===== tiny DSP =====
 def H(n,t): return 1.0 if t<=1 else 0.5*(1.0-math.cos(2*math.pi*(n/(t-1))))
-def C(x): return -1.0 if x<-1.0 else 1.0 if x>1.0 else x
-def PCM16(a): return b"".join(struct.pack("<h",int(C(s)*32767)) for s in a)
+_HN={}
+def HN(t):  # whole Hann window of length t, built once per length
+    w=_HN.get(t)
+    if w is None: w=_HN[t]=tuple(H(i,t) for i in range(t))
+    return w
+def PCM16(a):
+    b=array("h",[int((-1.0 if s<-1.0 else 1.0 if s>1.0 else s)*32767) for s in a])  # clip inline: no call per sample
+    if sys.byteorder=="big": b.byteswap()
+    return b.tobytes()
+def WAVHDR(n,sr):  # fixed 44-byte RIFF header: mono, 16-bit PCM, n data bytes
+    return struct.pack("<4sI4s4sIHHIIHH4sI",b"RIFF",36+n,b"WAVE",b"fmt ",16,1,1,sr,sr*2,2,16,b"data",n)
 def WAVBYTES(a,sr):
-    b=io.BytesIO()
-    with wave.open(b,"wb") as w: w.setnchannels(1);w.setsampwidth(2);w.setframerate(sr);w.writeframes(PCM16(a))
-    return b.getvalue()
-def LIM(a,p=0.98,dc=True):
+    d=PCM16(a); return WAVHDR(len(d),sr)+d
+def LIM(a,p=0.98,dc=True):  # DC block + peak limit in one pass over the samples
     if not a: return a
-    if dc: m=sum(a)/len(a); a=[s-m for s in a]
-    pk=max(1e-12,max(abs(s) for s in a))
-    if pk>p: sc=p/pk; a=[s*sc for s in a]
-    return a
+    m=sum(a)/len(a) if dc else 0.0; pk=max(1e-12,max(a)-m,m-min(a))
+    if pk>p: sc=p/pk; return [(s-m)*sc for s in a]
+    return [s-m for s in a] if dc else a
+def WF(wf,du,ph):  # waveform over a whole list of accumulated phases; one branch-free pass per shape
+    if wf=="sine": return list(map(math.sin,ph))
+    it=1.0/(2*math.pi); P=[(x*it)%1.0 for x in ph]
+    if wf=="tri": return [2.0*abs(2.0*p-1.0)-1.0 for p in P]
+    if wf=="saw": return [2.0*p-1.0 for p in P]
+    return [1.0 if p<du else -1.0 for p in P]
 def FX(f,ms,wf,du,vrt,vrd,amp,sr):
-    n=int(sr*ms/1000); o=[0.0]*n; ph=0.0
-    for i in range(n):
-        t=i/sr; ff=f*(1.0+vrd*math.sin(2*math.pi*vrt*t)) if vrt>0 else f
-        ph+=2*math.pi*ff/sr; p=(ph/(2*math.pi))%1.0
-        if wf=="sine": v=math.sin(ph)
-        elif wf=="tri":  v=2.0*abs(2.0*p-1.0)-1.0
-        elif wf=="saw":  v=2.0*p-1.0
-        else:            v=1.0 if p<du else -1.0
-        o[i]=v*H(i,n)*amp
-    return o
+    n=int(sr*ms/1000); w0=2*math.pi*f/sr; wv=2*math.pi*vrt/sr  # rad/sample, hoisted
+    d=[w0+w0*vrd*v for v in map(math.sin,[wv*i for i in range(n)])] if vrt>0 else [w0]*n
+    return [v*w*amp for v,w in zip(WF(wf,du,accumulate(d)),HN(n))]
 def SW(f0,f1,ms,wf,amp,sr):
-    n=int(sr*ms/1000); o=[0.0]*n; ph=0.0
-    for i in range(n):
-        u=i/max(1,n-1); f=f0+(f1-f0)*u; ph+=2*math.pi*f/sr; p=(ph/(2*math.pi))%1.0
-        if wf=="sine": v=math.sin(ph)
-        elif wf=="tri": v=2.0*abs(2.0*p-1.0)-1.0
-        elif wf=="saw": v=2.0*p-1.0
-        else:           v=math.sin(ph)
-        o[i]=v*H(i,n)*amp
-    return o
+    n=int(sr*ms/1000); w0=2*math.pi*f0/sr; sl=2*math.pi*(f1-f0)/(sr*max(1,n-1))
+    d=[w0+sl*i for i in range(n)]
+    return [v*w*amp for v,w in zip(WF(wf if wf in ("tri","saw") else "sine",0,accumulate(d)),HN(n))]
 def NZ(ms,a,amp,sr):
-    n=int(sr*ms/1000); o=[0.0]*n; y=0.0
-    for i in range(n):
-        x=random.random()*2-1; y=a*x+(1.0-a)*y; o[i]=y*H(i,n)*amp
+    n=int(sr*ms/1000); b=1.0-a; y=0.0; o=[]; ap=o.append; r=random.random
+    for w in HN(n): y=a*(r()*2-1)+b*y; ap(y*w*amp)  # one-pole lowpass: inherently serial
     return o
+def ROT(f,n,sr):  # sin(2π·f·i/sr), i<n, by rotating a unit phasor: one complex mul per sample
+    if n<1: return []
+    return [z.imag for z in accumulate(repeat(cmath.exp(2j*math.pi*f/sr),n-1),mul,initial=1+0j)]
 def FM(fc,rat,idx,ms,amp,sr):
-    n=int(sr*ms/1000); o=[0.0]*n
-    for i in range(n):
-        t=i/sr; m=math.sin(2*math.pi*(fc*rat)*t); v=math.sin(2*math.pi*fc*t+idx*m); o[i]=v*H(i,n)*amp
-    return o
+    n=int(sr*ms/1000); wc=2*math.pi*fc/sr
+    v=map(math.sin,[wc*i+idx*m for i,m in enumerate(ROT(fc*rat,n,sr))])
+    return [x*w*amp for x,w in zip(v,HN(n))]
 
 # ===== variations (20) =====
-# Each entry: (name, grain_fn) where grain_fn returns the sample list (uses A,SR)
+# Each entry: name -> terms; a term is (fn, args, amp×) called as fn(*args,A*amp×,SR).
+# Terms are concatenated end to end (same as `+` on the sample lists).
 A_DEFAULT=0.24
+FN={"FX":FX,"SW":SW,"NZ":NZ,"FM":FM}
 def V_RECIPES():
-    A,SR="A","SR"
     R={
-"pulse25_mid":      f"FX(820,55,'pulse',0.25,0,0,{A},{SR})",
-"pulse12_bright":   f"FX(920,55,'pulse',0.125,0,0,{A},{SR})",
-"triangle_soft":    f"FX(600,55,'tri',0.25,0,0,{A},{SR})",
-"saw_buzzy":        f"FX(700,55,'saw',0.25,0,0,{A},{SR})",
-"sine_up_sweep":    f"SW(650,900,70,'sine',{A},{SR})",
-"sine_down_sweep":  f"SW(950,650,70,'sine',{A},{SR})",
-"pulse_vibrato":    f"FX(850,60,'pulse',0.25,8.0,0.06,{A},{SR})",
-"noise_click":      f"NZ(40,0.22,{A}*0.9,{SR})",
-"two_tone":         f"FX(700,26,'sine',0.25,0,0,{A},{SR})+FX(950,26,'sine',0.25,0,0,{A},{SR})",
-"arp_chiptune":     f"FX(500,18,'pulse',0.25,0,0,{A},{SR})+FX(650,18,'pulse',0.25,0,0,{A},{SR})+FX(820,18,'pulse',0.25,0,0,{A},{SR})",
-"ct_snes_pulse":    f"FX(840,45,'pulse',0.25,0,0,{A}*0.95,{SR})",
-"eb_snes_blip":     f"FX(680,50,'tri',0,0,0,{A},{SR})",
-"ff6_snes_tri":     f"FX(610,55,'tri',0,0,0,{A},{SR})",
-"pkmn_gb_square12": f"FX(980,60,'pulse',0.125,0,0,{A},{SR})",
-"dq_nes_square50":  f"FX(440,45,'pulse',0.50,0,0,{A},{SR})",
-"fe_gba_click":     f"NZ(24,0.10,{A}*0.80,{SR})+FX(800,18,'sine',0,0,0,{A}*0.75,{SR})",
-"gs_gba_saw":       f"FX(720,55,'saw',0,0,0,{A},{SR})",
-"pm_n64_chirp":     f"SW(500,860,48,'sine',{A},{SR})",
-"ps4_gen_fm":       f"FM(600,2.0,1.2,55,{A},{SR})",
-"ut_default_blip":  f"FX(760,36,'pulse',0.25,14.0,0.05,{A},{SR})",
+"pulse25_mid":      (("FX",(820,55,'pulse',0.25,0,0),1),),
+"pulse12_bright":   (("FX",(920,55,'pulse',0.125,0,0),1),),
+"triangle_soft":    (("FX",(600,55,'tri',0.25,0,0),1),),
+"saw_buzzy":        (("FX",(700,55,'saw',0.25,0,0),1),),
+"sine_up_sweep":    (("SW",(650,900,70,'sine'),1),),
+"sine_down_sweep":  (("SW",(950,650,70,'sine'),1),),
+"pulse_vibrato":    (("FX",(850,60,'pulse',0.25,8.0,0.06),1),),
+"noise_click":      (("NZ",(40,0.22),0.9),),
+"two_tone":         (("FX",(700,26,'sine',0.25,0,0),1),("FX",(950,26,'sine',0.25,0,0),1)),
+"arp_chiptune":     (("FX",(500,18,'pulse',0.25,0,0),1),("FX",(650,18,'pulse',0.25,0,0),1),("FX",(820,18,'pulse',0.25,0,0),1)),
+"ct_snes_pulse":    (("FX",(840,45,'pulse',0.25,0,0),0.95),),
+"eb_snes_blip":     (("FX",(680,50,'tri',0,0,0),1),),
+"ff6_snes_tri":     (("FX",(610,55,'tri',0,0,0),1),),
+"pkmn_gb_square12": (("FX",(980,60,'pulse',0.125,0,0),1),),
+"dq_nes_square50":  (("FX",(440,45,'pulse',0.50,0,0),1),),
+"fe_gba_click":     (("NZ",(24,0.10),0.80),("FX",(800,18,'sine',0,0,0),0.75)),
+"gs_gba_saw":       (("FX",(720,55,'saw',0,0,0),1),),
+"pm_n64_chirp":     (("SW",(500,860,48,'sine'),1),),
+"ps4_gen_fm":       (("FM",(600,2.0,1.2,55),1),),
+"ut_default_blip":  (("FX",(760,36,'pulse',0.25,14.0,0.05),1),),
     }
     return R
+def EXPR(terms):  # source form of a recipe, for export_py
+    return "+".join(f"{fn}({','.join(map(repr,args))},A{'' if k==1 else '*'+repr(k)},SR)" for fn,args,k in terms)
 
-def build_vars(amp,sr):
-    R=V_RECIPES(); V=[]
-    for n,expr in R.items():
-        g=eval(expr,{"FX":FX,"SW":SW,"NZ":NZ,"FM":FM,"A":amp,"SR":sr})
-        V.append((n,LIM(g),len(g)*1000/sr))
-    return V
+@lru_cache(maxsize=16)
+def build_vars(amp,sr):  # memoized: revisiting an AMP/SR pair skips all 20 renders
+    R=V_RECIPES(); pool=array("d"); sl=[]  # whole bank in one packed buffer
+    for n,terms in R.items():
+        g=[]
+        for fn,args,k in terms: g+=FN[fn](*args,amp*k,sr)
+        sl.append((n,len(pool),len(g))); pool.extend(LIM(g))
+    mv=memoryview(pool)
+    return tuple((n,mv[o:o+l],l*1000/sr) for n,o,l in sl)
 
 # ===== schedule + render (one mix per line) =====
+def OFS(text,cps,pm):  # start time of every char slot plus the end of the last, as one running sum
+    step=1.0/max(1.0,cps)
+    return list(accumulate((step*(pm if ch in PUNCT else 1.0) for ch in text),initial=0.0))
 def sched(text,cps,pm,ws,gl,sr):
-    st=[]; t=0.0; step=1.0/max(1.0,cps)
-    for ch in text:
-        if ch.strip() or ws: st.append(int(t*sr))
-        t+=step*(pm if ch in PUNCT else 1.0)
-    return st,int((t+gl/sr+0.12)*sr)+1
+    T=OFS(text,cps,pm)
+    return [int(t*sr) for ch,t in zip(text,T) if ws or ch.strip()],int((T[-1]+gl/sr+0.12)*sr)+1
 def render_line(text,grain,sr,cps,pm,ws):
-    gl=len(grain); st,TL=sched(text,cps,pm,ws,gl,sr); buf=[0.0]*TL
+    grain=list(grain); gl=len(grain); st,TL=sched(text,cps,pm,ws,gl,sr); buf=[0.0]*TL; end=0  # buf[end:] still silent
     for s0 in st:
-        j=s0; i=0; e=min(TL,s0+gl)
-        while j<e: buf[j]+=grain[i]; j+=1; i+=1
-    return LIM(buf,0.95,True)
+        e=min(TL,s0+gl)
+        if s0>=end: buf[s0:e]=grain[:e-s0]
+        else: buf[s0:e]=map(add,buf[s0:e],grain)
+        end=max(end,e)
+    return array("f",LIM(buf,0.95,True))  # packed float32: 4 B/sample instead of a boxed float each
+@lru_cache(maxsize=128)
+def line_wav(n,text,amp,sr,cps,pm,ws):  # WAV bytes of one line; repeats (Play ALL, replays) are free
+    g=next(g for m,g,_ in build_vars(amp,sr) if m==n)
+    return WAVBYTES(render_line(text,g,sr,cps,pm,ws),sr)
 
 # ===== player =====
+# raw s16le mono on stdin: one long-lived process keeps the device open across lines
+PIPE_CMD={"paplay":lambda sr:["paplay","--raw","--format=s16le","--channels=1",f"--rate={sr}","--latency-msec=60"],
+          "aplay": lambda sr:["aplay","-q","-t","raw","-f","S16_LE","-c","1","-r",str(sr),"-B","60000"]}
 class P:
     def __init__(s):
         s.mode="winsound" if WIN else ("afplay" if MAC and shutil.which("afplay") else ("paplay" if shutil.which("paplay") else ("aplay" if shutil.which("aplay") else "bell")))
-        s.mem=False; s.p=None; s.path=None; s.hold=None
-    def toggle(s):
-        if WIN: s.mem=not s.mem
+        s.p=None; s.pp=None; s.psr=0; s.q=None; s.end=0.0
+        s.wp=os.path.join(tempfile.gettempdir(),f"blip_{os.getpid()}.wav"); atexit.register(s.unlink)  # one file, rewritten per play
+    def unlink(s):
+        try: os.remove(s.wp)
+        except OSError: pass
+    def pipe(s,sr):  # (re)open the persistent player; False -> fall back to a file per line
+        if s.pp and s.pp.poll() is None and s.psr==sr: return True
+        s.close()
+        try: s.pp=subprocess.Popen(PIPE_CMD[s.mode](sr),stdin=subprocess.PIPE,stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
+        except: s.pp=None; return False
+        s.psr=sr; s.q=queue.Queue(); s.end=0.0
+        threading.Thread(target=P.feed,args=(s.pp,s.q),daemon=True).start(); return True
+    @staticmethod
+    def feed(pp,q):  # pipe writes block while the device drains, so they stay off the main thread
+        while (b:=q.get()) is not None:
+            try: pp.stdin.write(b); pp.stdin.flush()
+            except: break
+    def close(s):
+        if not s.pp: return
+        s.q.put(None)
+        try: s.pp.terminate(); s.pp.wait(timeout=0.2)
+        except:
+            try: s.pp.kill()
+            except: pass
+        s.pp=None
     def reset(s,kill=False):
         if s.p and s.p.poll() is None:
             try: s.p.terminate(); s.p.wait(timeout=0.2)
             except: 
                 try: s.p.kill()
                 except: pass
-        s.p=None
+        s.p=None; s.close()
         if WIN:
             try:
                 import winsound; winsound.PlaySound(None, winsound.SND_PURGE)
             except: pass
-            if s.path and os.path.exists(s.path):
-                try: os.remove(s.path)
-                except: pass
-            s.path=None; s.hold=None
         elif kill:
             for nm in ("afplay","paplay","aplay"):
                 if shutil.which("pkill"):
@@ -130,54 +167,44 @@ class P:
                 if shutil.which("killall"):
                     try: subprocess.run(["killall","-q",nm],stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
                     except: pass
-    def play(s,a,sr,tmp):
-        dur=len(a)/float(sr)
+    def play(s,a,sr,tmp): return s.playw(WAVBYTES(a,sr),sr,tmp)
+    def playw(s,d,sr,tmp):  # d: a complete mono 16-bit WAV (44-byte header + PCM)
+        dur=(len(d)-44)/(2.0*sr)
         if WIN:
-            import winsound
-            if s.mem:
-                d=WAVBYTES(a,sr); s.hold=d; winsound.PlaySound(d, winsound.SND_MEMORY|winsound.SND_ASYNC)
-            else:
-                p=os.path.join(tmp,f"blip_{int(time.time()*1000)}.wav")
-                with wave.open(p,"wb") as w: w.setnchannels(1);w.setsampwidth(2);w.setframerate(sr);w.writeframes(PCM16(a))
-                s.path=p; winsound.PlaySound(p, winsound.SND_FILENAME|winsound.SND_ASYNC)
+            import winsound  # SND_ASYNC can't play from memory, so the per-process file it is
+            winsound.PlaySound(None, 0)  # stop anything still playing before its file is rewritten
+            with open(s.wp,"wb") as f: f.write(d)
+            winsound.PlaySound(s.wp, winsound.SND_FILENAME|winsound.SND_ASYNC)
+        elif s.mode in PIPE_CMD and s.pipe(sr):
+            s.q.put(memoryview(d)[44:]); s.end=max(s.end,time.monotonic())+dur
         elif s.mode in ("afplay","paplay","aplay"):
-            p=os.path.join(tmp,f"blip_{int(time.time()*1000)}.wav")
-            with wave.open(p,"wb") as w: w.setnchannels(1);w.setsampwidth(2);w.setframerate(sr);w.writeframes(PCM16(a))
-            try: s.p=subprocess.Popen([s.mode,p] if s.mode!="aplay" else ["aplay","-q",p],stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL); s.path=p
+            p=s.wp+".tmp"
+            with open(p,"wb") as f: f.write(d)
+            os.replace(p,s.wp)  # atomic swap: a player still reading the previous line keeps its own inode
+            try: s.p=subprocess.Popen([s.mode,s.wp] if s.mode!="aplay" else ["aplay","-q",s.wp],stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
             except: s.p=None
         else:
             sys.stdout.write("\a"); sys.stdout.flush()
         return dur
     def wait(s,sec):
-        if WIN:
-            time.sleep(max(0.0,sec))
-            if s.path and os.path.exists(s.path):
-                try: os.remove(s.path)
-                except: pass
-            s.path=None; s.hold=None
+        if WIN: time.sleep(max(0.0,sec))
+        elif s.pp:  # queued audio has played out at s.end
+            time.sleep(max(0.0,min(sec,s.end-time.monotonic())))
         elif s.p:
             try: s.p.wait(timeout=sec)
             except subprocess.TimeoutExpired: pass
-            if s.path and os.path.exists(s.path):
-                try: os.remove(s.path)
-                except: pass
-            s.path=None
     def beep(s,sr=44100):
-        n=int(sr*0.3); t=[math.sin(2*math.pi*440*i/sr)*0.3 for i in range(n)]
+        t=[x*0.3 for x in ROT(440,int(sr*0.3),sr)]
         s.play(LIM(t),sr,tempfile.gettempdir()); s.wait(0.35)
-    def label(s): return ("winsound-"+("mem" if s.mem else "file")) if WIN else s.mode
+    def label(s): return s.mode
 
 # ===== printing =====
 def print_sync(text,cps,pm):
-    step=1.0/max(1.0,cps); t0=time.monotonic(); t=0.0
-    for ch in text:
-        target=t0+t
-        while True:
-            dt=target-time.monotonic()
-            if dt<=0: break
-            time.sleep(0.001 if dt<0.01 else 0.01)
+    t0=time.monotonic()
+    for ch,t in zip(text,OFS(text,cps,pm)):
+        dt=t0+t-time.monotonic()  # one sleep to the char's due time (1 ms timer on Windows, see main)
+        if dt>0: time.sleep(dt)
         sys.stdout.write(ch); sys.stdout.flush()
-        t+=step*(pm if ch in PUNCT else 1.0)
     if not text.endswith("\n"): print()
 
 # ===== export helpers =====
@@ -187,30 +214,39 @@ def used_funcs(expr):
         if k in expr: u.add(k)
     return u
 
-def export_py(name,expr,stem,sr,amp,cps,pm,ws):
-    f=used_funcs(expr); inc=[]
-    if "FX" in f: inc.append("def FX(f,ms,wf,du,vrt,vrd,A,SR):\n n=int(SR*ms/1000);o=[0.0]*n;ph=0.0\n for i in range(n):\n  t=i/SR;ff=f*(1.0+vrd*math.sin(2*math.pi*vrt*t)) if vrt>0 else f\n  ph+=2*math.pi*ff/SR;p=(ph/(2*math.pi))%1.0\n  v=math.sin(ph) if wf=='sine' else (2.0*abs(2.0*p-1.0)-1.0 if wf=='tri' else (2.0*p-1.0 if wf=='saw' else (1.0 if p<du else -1.0)))\n  o[i]=v*(0.5*(1.0-math.cos(2*math.pi*(i/(n-1)))) if n>1 else 1.0)*A\n return o")
-    if "SW" in f: inc.append("def SW(f0,f1,ms,wf,A,SR):\n n=int(SR*ms/1000);o=[0.0]*n;ph=0.0\n for i in range(n):\n  u=i/max(1,n-1);f=f0+(f1-f0)*u;ph+=2*math.pi*f/SR;p=(ph/(2*math.pi))%1.0\n  v=math.sin(ph) if wf=='sine' else (2.0*abs(2.0*p-1.0)-1.0 if wf=='tri' else 2.0*p-1.0)\n  o[i]=v*(0.5*(1.0-math.cos(2*math.pi*(i/(n-1)))) if n>1 else 1.0)*A\n return o")
-    if "NZ" in f: inc.append("def NZ(ms,a,A,SR):\n n=int(SR*ms/1000);o=[0.0]*n;y=0.0\n for i in range(n):\n  x=random.random()*2-1;y=a*x+(1.0-a)*y\n  o[i]=y*(0.5*(1.0-math.cos(2*math.pi*(i/(n-1)))) if n>1 else 1.0)*A\n return o")
-    if "FM" in f: inc.append("def FM(fc,rat,idx,ms,A,SR):\n n=int(SR*ms/1000);o=[0.0]*n\n for i in range(n):\n  t=i/SR;m=math.sin(2*math.pi*(fc*rat)*t);v=math.sin(2*math.pi*fc*t+idx*m)\n  o[i]=v*(0.5*(1.0-math.cos(2*math.pi*(i/(n-1)))) if n>1 else 1.0)*A\n return o")
-    code=f"""# blip_export_{name}.py — standalone
-import io,math,os,platform,random,struct,subprocess,tempfile,time,wave,sys
+# exported oscillators: standalone list-pass copies of FX/SW/NZ/FM above (HN/WF are shared helpers)
+XF={
+"HN":"def HN(n): return [0.5*(1.0-math.cos(2*math.pi*(i/(n-1)))) if n>1 else 1.0 for i in range(n)]",
+"WF":"def WF(wf,du,ph):\n if wf=='sine': return list(map(math.sin,ph))\n it=1.0/(2*math.pi);P=[(x*it)%1.0 for x in ph]\n if wf=='tri': return [2.0*abs(2.0*p-1.0)-1.0 for p in P]\n if wf=='saw': return [2.0*p-1.0 for p in P]\n return [1.0 if p<du else -1.0 for p in P]",
+"FX":"def FX(f,ms,wf,du,vrt,vrd,A,SR):\n n=int(SR*ms/1000);w0=2*math.pi*f/SR;wv=2*math.pi*vrt/SR\n d=[w0+w0*vrd*v for v in map(math.sin,[wv*i for i in range(n)])] if vrt>0 else [w0]*n\n return [v*w*A for v,w in zip(WF(wf,du,accumulate(d)),HN(n))]",
+"SW":"def SW(f0,f1,ms,wf,A,SR):\n n=int(SR*ms/1000);w0=2*math.pi*f0/SR;sl=2*math.pi*(f1-f0)/(SR*max(1,n-1))\n d=[w0+sl*i for i in range(n)]\n return [v*w*A for v,w in zip(WF(wf if wf in ('tri','saw') else 'sine',0,accumulate(d)),HN(n))]",
+"NZ":"def NZ(ms,a,A,SR):\n n=int(SR*ms/1000);b=1.0-a;y=0.0;o=[];ap=o.append;r=random.random\n for w in HN(n): y=a*(r()*2-1)+b*y;ap(y*w*A)\n return o",
+"FM":"def FM(fc,rat,idx,ms,A,SR):\n n=int(SR*ms/1000);wc=2*math.pi*fc/SR;r=cmath.exp(2j*math.pi*(fc*rat)/SR)\n M=[z.imag for z in accumulate(repeat(r,n-1),mul,initial=1+0j)] if n else []\n v=map(math.sin,[wc*i+idx*m for i,m in enumerate(M)])\n return [x*w*A for x,w in zip(v,HN(n))]",
+}
+XHEAD="""import cmath,math,os,platform,random,shutil,struct,subprocess,tempfile,time,sys
+from array import array
+from itertools import accumulate,repeat
+from operator import mul
 WIN=platform.system()=='Windows'
-def PCM16(a):\n return b''.join(struct.pack('<h',int(max(-1,min(1,s))*32767)) for s in a)
-def LIM(a,p=0.98):\n pk=max(1e-12,max(abs(s) for s in a));\n return a if pk<=p else [s*(p/pk) for s in a]
-{"\n".join(inc)}
-def make_grain(A,SR):\n return LIM({expr})
-def sched(text,C,PM,WS,GL,SR):\n st=[];t=0.0;step=1.0/max(1.0,C)\n for ch in text:\n  import string\n  if (ch.strip()!='') or WS: st.append(int(t*SR))\n  t+=step*(PM if ch in '.!?;:' else 1.0)\n return st,int((t+GL/SR+0.12)*SR)+1
+def PCM16(a):\n b=array('h',[int((-1.0 if s<-1.0 else 1.0 if s>1.0 else s)*32767) for s in a])\n if sys.byteorder=='big': b.byteswap()\n return b.tobytes()
+def WAV(a,SR):\n d=PCM16(a)\n return struct.pack('<4sI4s4sIHHIIHH4sI',b'RIFF',36+len(d),b'WAVE',b'fmt ',16,1,1,SR,SR*2,2,16,b'data',len(d))+d
+def LIM(a,p=0.98):\n pk=max(1e-12,max(abs(s) for s in a));\n return a if pk<=p else [s*(p/pk) for s in a]"""
+XTAIL="""def sched(text,C,PM,WS,GL,SR):\n st=[];t=0.0;step=1.0/max(1.0,C)\n for ch in text:\n  if (ch.strip()!='') or WS: st.append(int(t*SR))\n  t+=step*(PM if ch in '.!?;:' else 1.0)\n return st,int((t+GL/SR+0.12)*SR)+1
 def render(text,g,SR,C,PM,WS):\n GL=len(g);st,TL=sched(text,C,PM,WS,GL,SR);buf=[0.0]*TL\n for s0 in st:\n  j=s0;i=0;e=min(TL,s0+GL)\n  while j<e: buf[j]+=g[i];j+=1;i+=1\n pk=max(1e-12,max(abs(s) for s in buf));\n return buf if pk<=0.95 else [s*(0.95/pk) for s in buf]
-def play(a,SR):\n d=len(a)/SR\n if WIN:\n  import winsound,os,wave\n  p=os.path.join(tempfile.gettempdir(),f'blip_{{int(time.time()*1000)}}.wav')\n  with wave.open(p,'wb') as w: w.setnchannels(1);w.setsampwidth(2);w.setframerate(SR);w.writeframes(PCM16(a))\n  winsound.PlaySound(p, winsound.SND_FILENAME)\n  try: os.remove(p)\n  except: pass\n else:\n  p=os.path.join(tempfile.gettempdir(),f'blip_{{int(time.time()*1000)}}.wav')\n  with wave.open(p,'wb') as w: w.setnchannels(1);w.setsampwidth(2);w.setframerate(SR);w.writeframes(PCM16(a))\n  cmd='afplay' if shutil.which('afplay') else ('paplay' if shutil.which('paplay') else 'aplay')\n  try: subprocess.run([cmd,p])\n  except: pass\n  try: os.remove(p)\n  except: pass\n return d
-def print_sync(text,C,PM):\n step=1.0/max(1.0,C);t0=time.monotonic();t=0.0\n for ch in text:\n  tgt=t0+t\n  while True:\n   dt=tgt-time.monotonic()\n   if dt<=0: break\n   time.sleep(0.001 if dt<0.01 else 0.01)\n  sys.stdout.write(ch);sys.stdout.flush();t+=step*(PM if ch in '.!?;:' else 1.0)\n if not text.endswith('\\n'): print()
-if __name__=='__main__':\n TXT="Link, can you hear me? The forest is whispering..."\n SR={sr};A={amp};C={cps};PM={pm};WS={str(ws)}\n g=make_grain(A,SR); buf=render(TXT,g,SR,C,PM,WS)\n play(buf,SR); print_sync(TXT,C,PM)
-"""
-    with open(f"{stem}_mini.py","w",encoding="utf-8") as f: f.write(code)
+def play(a,SR):\n d=len(a)/SR\n if WIN:\n  import winsound\n  p=os.path.join(tempfile.gettempdir(),f'blip_{int(time.time()*1000)}.wav')\n  with open(p,'wb') as f: f.write(WAV(a,SR))\n  winsound.PlaySound(p, winsound.SND_FILENAME)\n  try: os.remove(p)\n  except: pass\n else:\n  p=os.path.join(tempfile.gettempdir(),f'blip_{int(time.time()*1000)}.wav')\n  with open(p,'wb') as f: f.write(WAV(a,SR))\n  cmd='afplay' if shutil.which('afplay') else ('paplay' if shutil.which('paplay') else 'aplay')\n  try: subprocess.run([cmd,p])\n  except: pass\n  try: os.remove(p)\n  except: pass\n return d
+def print_sync(text,C,PM):\n step=1.0/max(1.0,C);t0=time.monotonic();t=0.0\n for ch in text:\n  dt=t0+t-time.monotonic()\n  if dt>0: time.sleep(dt)\n  sys.stdout.write(ch);sys.stdout.flush();t+=step*(PM if ch in '.!?;:' else 1.0)\n if not text.endswith('\\n'): print()"""
+
+def export_py(name,expr,stem,sr,amp,cps,pm,ws):
+    f=used_funcs(expr); inc=[XF["HN"]]+([XF["WF"]] if f&{"FX","SW"} else [])+[XF[k] for k in ("FX","SW","NZ","FM") if k in f]
+    main=f'if __name__==\'__main__\':\n TXT="Link, can you hear me? The forest is whispering..."\n SR={sr};A={amp};C={cps};PM={pm};WS={ws}\n g=make_grain(A,SR); buf=render(TXT,g,SR,C,PM,WS)\n play(buf,SR); print_sync(TXT,C,PM)'
+    code=bytearray(f"# blip_export_{name}.py — standalone\n".encode())
+    for part in (XHEAD,*inc,f"def make_grain(A,SR):\n return LIM({expr})",XTAIL,main): code+=part.encode()+b"\n"
+    fd=os.open(f"{stem}_mini.py",os.O_WRONLY|os.O_CREAT|os.O_TRUNC|getattr(os,"O_BINARY",0),0o644)
+    try: os.write(fd,code)
+    finally: os.close(fd)
 
 def export_wav(name,grain,stem,sr):
-    with wave.open(f"{stem}.wav","wb") as w:
-        w.setnchannels(1); w.setsampwidth(2); w.setframerate(sr); w.writeframes(PCM16(grain))
+    with open(f"{stem}.wav","wb") as f: f.write(WAVBYTES(grain,sr))
 
 # ===== UI =====
 B=(
@@ -222,7 +258,6 @@ B=(
 "  C) CPS           P) Punct×     W) Whitespace\n"
 "  G) Post‑gap      F) Flush ms   S) Amplitude\n"
 "  H) Sample rate   K) Deep clear L) List   Q) Quit\n"
-+("  D) (Windows) Toggle winsound driver (file/mem)\n" if WIN else "")+
 "---------------------------------------------------------------"
 )
 def cls(): os.system("cls" if os.name=="nt" else "clear")
@@ -243,24 +278,44 @@ def edit_lines():
 # ===== main =====
 def settle(pl,sr,ms):
     n=int(sr*ms/1000); pl.play([0.0]*max(1,n),sr,tempfile.gettempdir()); pl.wait(ms/1000+0.05)
-def play_line(text,grain,cfg,pl,tmp):
-    d=pl.play(render_line(text,grain,cfg['sr'],cfg['cps'],cfg['pm'],cfg['ws']),cfg['sr'],tmp)
+def play_line(text,n,cfg,pl,tmp,w=None):
+    d=pl.playw(w or line_wav(n,text,cfg['amp'],cfg['sr'],cfg['cps'],cfg['pm'],cfg['ws']),cfg['sr'],tmp)
     print_sync(text,cfg['cps'],cfg['pm']); pl.wait(d+0.05); settle(pl,cfg['sr'],cfg['flush']); 
     if cfg['gap']>0: time.sleep(cfg['gap'])
-def play_var(var,cfg,pl,tmp):
+def play_var(var,cfg,pl,tmp,q=None):
     n,g,ms=var; h=f"=== {n} ({int(ms)} ms) ==="; print(h); print("-"*len(h))
-    for t in cfg['texts']: play_line(t,g,cfg,pl,tmp); print()
+    for t in cfg['texts']:
+        w=q.get() if q else None
+        if isinstance(w,Exception): raise w
+        play_line(t,n,cfg,pl,tmp,w); print()
+def prerender(jobs,cfg,stop):  # producer thread: line WAVs rendered ahead of playback, 2 in flight
+    q=queue.Queue(maxsize=2)
+    def work():
+        for n,t in jobs:
+            try: w=line_wav(n,t,cfg['amp'],cfg['sr'],cfg['cps'],cfg['pm'],cfg['ws'])
+            except Exception as e: w=e
+            while not stop.is_set():
+                try: q.put(w,timeout=0.1); break
+                except queue.Full: pass
+            if stop.is_set(): return
+    threading.Thread(target=work,daemon=True).start()
+    return q
 def play_all(V,cfg,pl,tmp):
     print(f"[ALL | driver={pl.label()} | sr={cfg['sr']} | amp={cfg['amp']:.2f} | cps={cfg['cps']:.1f}]")
-    for var in V: play_var(var,cfg,pl,tmp)
+    stop=threading.Event(); q=prerender([(n,t) for n,_,_ in V for t in cfg['texts']],cfg,stop)
+    try:
+        for var in V: play_var(var,cfg,pl,tmp,q)
+    finally: stop.set()
 
 def main():
     cfg={'texts':["Link, can you hear me? The forest is whispering...","A hero rises. A legend returns."],
          'cps':26.0,'pm':2.2,'ws':False,'gap':0.80,'flush':240,'amp':A_DEFAULT,'sr':44100,'deep':False}
+    if WIN:  # 1 ms scheduler tick so print_sync's per-char sleeps land on time
+        try: import ctypes; ctypes.windll.winmm.timeBeginPeriod(1); atexit.register(ctypes.windll.winmm.timeEndPeriod,1)
+        except: pass
     pl=P(); tmp=tempfile.gettempdir()
     V=build_vars(cfg['amp'],cfg['sr'])
     print("[Audio verify]"); pl.beep(cfg['sr']); settle(pl,cfg['sr'],cfg['flush'])
-    R=V_RECIPES()
     while True:
         menu(V,cfg,pl)
         try: ch=input("Choice > ").strip()
@@ -298,7 +353,6 @@ def main():
             except: v=None
             if v and 8000<=v<=192000: cfg['sr']=v; V=build_vars(cfg['amp'],cfg['sr']); settle(pl,cfg['sr'],cfg['flush']); print(f"SR {cfg['sr']}"); time.sleep(0.3); continue
         if c in ("k","kill","clear"): print("\nDeep clear…"); pl.reset(kill=True); settle(pl,cfg['sr'],cfg['flush']); print("Done."); time.sleep(0.4); continue
-        if c in ("d","driver") and WIN: pl.toggle(); print("Driver:",pl.label()); pl.reset(False); settle(pl,cfg['sr'],cfg['flush']); time.sleep(0.4); continue
         if c in ("e","export"):
             tgt=input("Export which (index or name)? ").strip().lower()
             idx=None
@@ -314,7 +368,7 @@ def main():
             try:
                 if kind in ("b","w"): export_wav(n,g,stem,cfg['sr'])
                 if kind in ("b","p"):
-                    expr=V_RECIPES()[n]
+                    expr=EXPR(V_RECIPES()[n])
                     export_py(n,expr,stem,cfg['sr'],cfg['amp'],cfg['cps'],cfg['pm'],cfg['ws'])
                 print("Exported.")
             except Exception as e:
@@ -2,7 +2,12 @@
 # blip_ollama_live.py — Stream from Ollama and play RPG-style text blips with model picker
 # Lists installed models via /api/tags and lets you select one. No external deps.
 
-import io, json, math, os, platform, queue, random, shutil, struct, subprocess, sys, tempfile, threading, time, wave, http.client
+import atexit, io, json, math, os, platform, queue, random, re, shutil, socket, struct, subprocess, sys, tempfile, threading, time, http.client
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from operator import add
 from urllib.parse import urlparse
 
 WIN = platform.system()=="Windows"
@@ -16,54 +21,98 @@ DEFAULT_CPS     = 26.0
 DEFAULT_PUNCT   = 2.2
 COALESCE_MS     = 180   # group tokens (~180ms) per audio render
 FLUSH_MS        = 220   # silence flush for device stability
-POST_GAP        = 0.10  # gap between chunks
+POST_GAP        = 0.10  # gap after the last queued chunk
+BATCH_MS        = 1000  # backlogged chunks are joined into one play up to this length
+JOIN_MS         = 20    # silence between joined chunks
 FILTER_THINK    = True  # strip <think>...</think> from AUDIO (still prints)
+RENDER_CACHE    = 256   # rendered chunks kept for repeated text (LRU)
 
 # ---------- tiny DSP ----------
 def H(n,t): return 1.0 if t<=1 else 0.5*(1.0-math.cos(2.0*math.pi*(n/(t-1))))
-def clamp(x): return -1.0 if x<-1.0 else 1.0 if x>1.0 else x
-def PCM16(a): return b"".join(struct.pack("<h", int(clamp(s)*32767)) for s in a)
+_HN={}
+def HN(t):
+    # whole Hann window per length; build_vars only uses a dozen or so lengths
+    w=_HN.get(t)
+    if w is None: w=_HN[t]=tuple(H(i,t) for i in range(t))
+    return w
+_ENV={}
+def ENV(t,amp):
+    # Hann window pre-scaled by amp: tones of the same length/level (two_tone, arp_chiptune
+    # steps, ...) share it, and each grain costs one multiply per sample on top of its wave
+    e=_ENV.get((t,amp))
+    if e is None: e=_ENV[(t,amp)]=tuple(w*amp for w in HN(t))
+    return e
+def LIM16(a,p=0.95):
+    # DC block + peak limit on an integer mix (int16 units), packed straight to s16le
+    # bytes in one array("h") fill; p is the peak as a fraction of full scale
+    if not a: return b""
+    m=sum(a)/len(a); lim=p*32767; pk=max(1e-12, max(a)-m, m-min(a))
+    sc=lim/pk if pk>lim else 1.0
+    b=array("h", [int((s-m)*sc) for s in a])
+    if sys.byteorder=="big": b.byteswap()
+    return b.tobytes()
+def WAVBYTES(pcm,sr):
+    # whole mono 16-bit WAV (44-byte RIFF header + data) so each chunk is one write
+    return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36+len(pcm), b"WAVE", b"fmt ", 16, 1, 1, sr, sr*2, 2, 16, b"data", len(pcm))+pcm
 def LIM(a,p=0.98,dc=True):
+    # DC removal and peak scaling fused into a single output pass; the peak of
+    # (s-m) is read off max/min directly since subtracting m keeps the order
     if not a: return a
-    if dc: m=sum(a)/len(a); a=[s-m for s in a]
-    pk=max(1e-12, max(abs(s) for s in a))
+    m=sum(a)/len(a) if dc else 0.0
+    pk=max(1e-12, max(a)-m, m-min(a))
     if pk>p:
-        sc=p/pk; a=[s*sc for s in a]
-    return a
+        sc=p/pk; return [(s-m)*sc for s in a]
+    return [s-m for s in a] if dc else a
+# waveform op table: FX/SW look the shape up once per grain, then make one pass over the
+# accumulated phases (radians; _IT turns them into cycles). sine stays on map(math.sin):
+# in CPython a 1024-point interpolated wavetable costs ~5x more per sample than libm
+_IT=1.0/(2.0*math.pi)
+WAVES={
+    "sine":  lambda ph,du: list(map(math.sin, ph)),
+    "tri":   lambda ph,du: [2.0*abs(2.0*((x*_IT)%1.0)-1.0)-1.0 for x in ph],
+    "saw":   lambda ph,du: [2.0*((x*_IT)%1.0)-1.0 for x in ph],
+    "pulse": lambda ph,du: [1.0 if (x*_IT)%1.0<du else -1.0 for x in ph],
+}
 def FX(f,ms,wf,du,vrt,vrd,amp,sr):
-    n=int(sr*ms/1000); o=[0.0]*n; ph=0.0
-    for i in range(n):
-        t=i/sr; ff=f*(1.0+vrd*math.sin(2.0*math.pi*vrt*t)) if vrt>0 else f
-        ph+=2.0*math.pi*ff/sr; p=(ph/(2.0*math.pi))%1.0
-        if   wf=="sine": v=math.sin(ph)
-        elif wf=="tri":  v=2.0*abs(2.0*p-1.0)-1.0
-        elif wf=="saw":  v=2.0*p-1.0
-        else:            v=1.0 if p<du else -1.0
-        o[i]=v*H(i,n)*amp
-    return o
+    n=int(sr*ms/1000); w0=2.0*math.pi*f/sr; wave=WAVES.get(wf, WAVES["pulse"])
+    if vrt>0:
+        wv=2.0*math.pi*vrt/sr
+        d=[w0*(1.0+vrd*v) for v in map(math.sin, [wv*i for i in range(n)])]
+    else: d=[w0]*n
+    return [v*e for v,e in zip(wave(accumulate(d),du),ENV(n,amp))]
 def SW(f0,f1,ms,wf,amp,sr):
-    n=int(sr*ms/1000); o=[0.0]*n; ph=0.0
-    for i in range(n):
-        u=i/max(1,n-1); f=f0+(f1-f0)*u; ph+=2.0*math.pi*f/sr; p=(ph/(2.0*math.pi))%1.0
-        v=math.sin(ph) if wf=="sine" else (2.0*abs(2.0*p-1.0)-1.0 if wf=="tri" else 2.0*p-1.0)
-        o[i]=v*H(i,n)*amp
-    return o
+    n=int(sr*ms/1000); w0=2.0*math.pi*f0/sr; sl=2.0*math.pi*(f1-f0)/(sr*max(1,n-1))
+    wave=WAVES[wf if wf in ("sine","tri") else "saw"]  # SW has no pulse: anything else is a saw
+    d=[w0+sl*i for i in range(n)]
+    return [v*e for v,e in zip(wave(accumulate(d),0),ENV(n,amp))]
 def NZ(ms,a,amp,sr):
-    n=int(sr*ms/1000); o=[0.0]*n; y=0.0
-    for i in range(n):
-        x=random.random()*2-1; y=a*x+(1.0-a)*y; o[i]=y*H(i,n)*amp
+    # one-pole lowpass is recursive, so this one stays a loop (with the lookups hoisted);
+    # a*(2x-1) is folded to a2*x-a to save two float ops per sample
+    n=int(sr*ms/1000); b=1.0-a; a2=2.0*a; y=0.0; o=[]; ap=o.append; r=random.random
+    for e in ENV(n,amp): y=a2*r()-a+b*y; ap(y*e)
     return o
 def FM(fc,rat,idx,ms,amp,sr):
-    n=int(sr*ms/1000); o=[0.0]*n
-    for i in range(n):
-        t=i/sr; m=math.sin(2.0*math.pi*(fc*rat)*t); v=math.sin(2.0*math.pi*fc*t+idx*m)
-        o[i]=v*H(i,n)*amp
-    return o
+    n=int(sr*ms/1000); wc=2.0*math.pi*fc/sr; wm=wc*rat
+    v=map(math.sin, [wc*i+idx*m for i,m in enumerate(map(math.sin, [wm*i for i in range(n)]))])
+    return [x*e for x,e in zip(v,ENV(n,amp))]
 
 # ---------- 20 variations ----------
+class Variations:
+    """Column layout: names and lengths side by side, every grain packed into one array("h")."""
+    def __init__(self):
+        self.names=[]; self.ms=[]; self.offs=[0]; self.pool=array("h")
+    def __len__(self): return len(self.names)
+    def add(self, name, samples, ms):
+        # quantized to int16 once here; LIM has already bounded the grain to +-0.98
+        self.names.append(name); self.ms.append(ms)
+        self.pool.extend([int(s*32767) for s in samples]); self.offs.append(len(self.pool))
+    def grain(self, i):
+        # zero-copy view into the shared pool
+        return memoryview(self.pool)[self.offs[i]:self.offs[i+1]]
+
 def build_vars(amp, sr):
-    V=[]
-    def mk(s,n,m): V.append((n, LIM(s), m))
+    V=Variations()
+    def mk(s,n,m): V.add(n, LIM(s), m)
     mk(FX(820,55,"pulse",0.25,0,0,amp,sr),                   "pulse25_mid",55)
     mk(FX(920,55,"pulse",0.125,0,0,amp,sr),                  "pulse12_bright",55)
     mk(FX(600,55,"tri",0.25,0,0,amp,sr),                     "triangle_soft",55)
@@ -88,20 +137,25 @@ def build_vars(amp, sr):
 
 # ---------- schedule & render ----------
 def schedule(text, cps, punct_mult, ws, glen, sr):
-    starts=[]; t=0.0; step=1.0/max(1.0,cps)
+    # per-char step picked from two precomputed values; no multiply or strip() per char
+    step=1.0/max(1.0,cps); ps=step*punct_mult
+    starts=[]; ap=starts.append; t=0.0
     for ch in text:
-        if ch.strip() or ws: starts.append(int(t*sr))
-        t += step * (punct_mult if ch in PUNCT else 1.0)
+        if ws or not ch.isspace(): ap(int(t*sr))
+        t += ps if ch in PUNCT else step
     total_sec = t + (glen/sr) + 0.12
     return starts, int(total_sec*sr)+1
 
 def render_line(text, grain, sr, cps, punct_mult, ws):
+    grain=list(grain)  # pool views come in as memoryviews; list reads are faster in the mix
     glen=len(grain); starts, TL = schedule(text, cps, punct_mult, ws, glen, sr)
-    buf=[0.0]*TL
+    buf=[0]*TL; end=0  # starts ascend, so buf[end:] is still silent
     for s0 in starts:
-        j=s0; i=0; e=min(TL,s0+glen)
-        while j<e: buf[j]+=grain[i]; j+=1; i+=1
-    return LIM(buf, 0.95, True)
+        e=min(TL,s0+glen)
+        if s0>=end: buf[s0:e]=grain[:e-s0]  # no overlap: plain copy
+        else: buf[s0:e]=map(add, buf[s0:e], grain)  # overlap: whole-grain slice add
+        end=max(end,e)
+    return LIM16(buf, 0.95)  # ints never overflow, so overlaps need no saturation until here
 
 # ---------- player ----------
 class Player:
@@ -112,18 +166,53 @@ class Player:
         elif shutil.which("aplay"):  self.mode="aplay"
         else: self.mode="bell"
         self.p=None; self.path=None
-    def play_async(self, samples, sr, tmpdir):
-        dur=len(samples)/float(sr)
+        self.pp=None; self.psr=0; self.end=0.0  # persistent raw player, its rate, when its queued audio ends
+    def raw_cmd(self, sr):
+        # paplay/aplay read headerless s16le from stdin, so those chunks never touch disk
+        if self.mode=="paplay": return ["paplay","--raw",f"--rate={sr}","--format=s16le","--channels=1"]
+        return ["aplay","-q","-t","raw","-f","S16_LE","-r",str(sr),"-c","1"]
+    def write_wav(self, pcm, sr, tmpdir):
+        # winsound/afplay (and paplay/aplay without a stream) need a file: one per process, rewritten for every chunk
+        if self.path is None:
+            self.path=os.path.join(tmpdir, f"blip_live_{os.getpid()}.wav")
+            atexit.register(self.unlink)
+        with open(self.path,"wb") as f: f.write(WAVBYTES(pcm, sr))
+        return self.path
+    def pipe(self, sr):
+        # one long-lived raw player per rate: the device stays open across chunks instead
+        # of a process spawn + device open per chunk
+        if self.pp and self.pp.poll() is None and self.psr==sr: return True
+        self.close()
+        try: self.pp = subprocess.Popen(self.raw_cmd(sr), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except: self.pp=None; return False
+        self.psr=sr; self.end=0.0
+        return True
+    def close(self):
+        if not self.pp: return
+        try: self.pp.stdin.close(); self.pp.wait(timeout=0.5)  # let the tail drain
+        except:
+            try: self.pp.kill()
+            except: pass
+        self.pp=None
+    def unlink(self):
+        try: os.remove(self.path)
+        except OSError: pass
+    def play_async(self, pcm, sr, tmpdir):
+        dur=len(pcm)/(2.0*sr)
         if self.mode=="winsound":
             import winsound
-            p=os.path.join(tmpdir, f"blip_{int(time.time()*1000)}.wav")
-            with wave.open(p,"wb") as w: w.setnchannels(1); w.setsampwidth(2); w.setframerate(sr); w.writeframes(PCM16(samples))
-            self.path=p; winsound.PlaySound(p, winsound.SND_FILENAME|winsound.SND_ASYNC)
-        elif self.mode in ("afplay","paplay","aplay"):
-            p=os.path.join(tmpdir, f"blip_{int(time.time()*1000)}.wav")
-            with wave.open(p,"wb") as w: w.setnchannels(1); w.setsampwidth(2); w.setframerate(sr); w.writeframes(PCM16(samples))
-            cmd=[self.mode, p] if self.mode!="aplay" else ["aplay","-q",p]
-            try: self.p = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL); self.path=p
+            winsound.PlaySound(self.write_wav(pcm, sr, tmpdir), winsound.SND_FILENAME|winsound.SND_ASYNC)
+        elif self.mode=="afplay":
+            try: self.p = subprocess.Popen(["afplay", self.write_wav(pcm, sr, tmpdir)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except: self.p=None
+        elif self.mode in ("paplay","aplay"):
+            if self.pipe(sr):
+                self.end=max(time.monotonic(), self.end)+dur
+                try: self.pp.stdin.write(pcm); self.pp.stdin.flush(); return dur  # blocks while the device drains
+                except OSError: self.close()  # player died; reopened on the next chunk
+            # no stream: play this chunk from the file rather than drop it
+            path=self.write_wav(pcm, sr, tmpdir)
+            try: self.p = subprocess.Popen([self.mode, path] if self.mode!="aplay" else ["aplay","-q",path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             except: self.p=None
         else:
             sys.stdout.write("\a"); sys.stdout.flush()
@@ -131,21 +220,17 @@ class Player:
     def wait_done(self, timeout):
         if self.mode=="winsound":
             time.sleep(max(0.0, timeout))
-            if self.path and os.path.exists(self.path):
-                try: os.remove(self.path)
-                except: pass
-            self.path=None
+            return
+        if self.pp:
+            # the stream never exits per chunk; pace on when its queued audio runs out
+            time.sleep(max(0.0, self.end-time.monotonic()))
             return
         if self.p:
             try: self.p.wait(timeout=timeout)
             except subprocess.TimeoutExpired: pass
-            if self.path and os.path.exists(self.path):
-                try: os.remove(self.path)
-                except: pass
-            self.path=None
     def flush_silence(self, sr, ms):
-        n=int(sr*ms/1000); s=[0.0]*max(1,n)
-        self.play_async(s, sr, tempfile.gettempdir()); self.wait_done(ms/1000.0+0.05)
+        n=int(sr*ms/1000)
+        self.play_async(bytes(2*max(1,n)), sr, tempfile.gettempdir()); self.wait_done(ms/1000.0+0.05)
 
 # ---------- Ollama endpoint discovery & model listing ----------
 def discover_endpoint():
@@ -160,17 +245,40 @@ def discover_endpoint():
         if u.port: port=u.port or (443 if scheme=="https" else 11434)
     return scheme, host, port
 
+_CONNS={}
 def _conn(scheme, host, port, timeout=3600):
-    return (http.client.HTTPSConnection if scheme=="https" else http.client.HTTPConnection)(host, port, timeout=timeout)
+    """One keep-alive connection per endpoint, shared by the model listing and generation."""
+    key=(scheme, host, port); c=_CONNS.get(key)
+    if c is None:
+        c=_CONNS[key]=(http.client.HTTPSConnection if scheme=="https" else http.client.HTTPConnection)(host, port, timeout=timeout)
+    c.timeout=timeout
+    if c.sock: c.sock.settimeout(timeout)
+    return c
+
+def _request(c, method, path, body=None, headers=None):
+    """Send on a (possibly reused) connection; retry once if the server dropped it while idle.
+    Any failure closes the connection so the next caller starts from a clean socket."""
+    for attempt in (0, 1):
+        try:
+            if c.sock is None:
+                c.connect()
+                # token lines are tiny; don't let Nagle hold them back
+                c.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            c.request(method, path, body=body, headers=headers or {})
+            return c.getresponse()
+        except (ConnectionError, http.client.ImproperConnectionState):
+            c.close()
+            if attempt: raise
+        except:
+            c.close()
+            raise
 
 def list_local_models(scheme, host, port):
     """Return a sorted list of model names via GET /api/tags; empty list if none/unavailable."""
+    c=_conn(scheme,host,port,timeout=8)
     try:
-        c=_conn(scheme,host,port,timeout=8)
-        c.request("GET","/api/tags")
-        r=c.getresponse()
-        data=r.read()
-        c.close()
+        r=_request(c,"GET","/api/tags")
+        data=r.read()  # read to the end so the connection stays reusable
         if r.status!=200: return []
         obj=json.loads(data.decode("utf-8"))
         names=[m.get("name","") for m in obj.get("models",[])]
@@ -178,6 +286,7 @@ def list_local_models(scheme, host, port):
         names.sort(key=lambda s:s.lower())
         return names
     except Exception:
+        c.close()  # a half-finished exchange would wedge the shared connection for stream_generate
         # Fallback: try CLI parsing if available
         try:
             out=subprocess.check_output(["ollama","list"], text=True, stderr=subprocess.DEVNULL)
@@ -206,6 +315,9 @@ def pick_installed_model(scheme, host, port):
     return names[idx-1]
 
 # ---------- streaming (NDJSON) ----------
+RESP_RE  = re.compile(rb'"response":"((?:[^"\\]|\\.)*)"')
+DONE_RE  = re.compile(rb'"done":true\b')
+NOT_DONE = b'"done":false'
 def stream_generate(model, prompt, scheme, host, port, options=None):
     """
     Yields incremental text chunks from /api/generate (NDJSON lines).
@@ -214,17 +326,28 @@ def stream_generate(model, prompt, scheme, host, port, options=None):
     if options: payload["options"]=options
     body=json.dumps(payload).encode("utf-8")
     c=_conn(scheme, host, port, timeout=3600)
-    c.request("POST","/api/generate", body=body, headers={"Content-Type":"application/json"})
-    r=c.getresponse()
-    for raw in r:
-        if not raw.strip(): continue
-        try: obj=json.loads(raw.decode("utf-8"))
-        except Exception: continue
-        if obj.get("done"): break
-        chunk = obj.get("response","")
-        if chunk: yield chunk
-    try: c.close()
-    except: pass
+    r=_request(c,"POST","/api/generate", body=body, headers={"Content-Type":"application/json"})
+    try:
+        for raw in r:
+            if not raw.strip(): continue
+            # fast path for Ollama's compact token lines: pull "response" out with a regex
+            # and only hand escaped strings to the JSON decoder
+            if DONE_RE.search(raw): break
+            m = RESP_RE.search(raw) if NOT_DONE in raw else None
+            if m:
+                s=m.group(1)
+                try: chunk = json.loads(b'"'+s+b'"') if b"\\" in s else s.decode("utf-8")
+                except Exception: continue
+            else:
+                try: obj=json.loads(raw.decode("utf-8"))
+                except Exception: continue
+                if obj.get("done"): break
+                chunk = obj.get("response","")
+            if chunk: yield chunk
+        r.read()  # drain the final stats line; the connection is then reused next time
+    except:
+        c.close()  # abandoned mid-stream (Ctrl+C, error): this socket can't be reused
+        raise
 
 # ---------- audio worker ----------
 class AudioWorker(threading.Thread):
@@ -232,35 +355,67 @@ class AudioWorker(threading.Thread):
         super().__init__(daemon=True)
         self.grain=grain; self.sr=sr; self.cps=cps; self.punct=punct_mult; self.ws=ws
         self.q=queue.Queue(); self.stop=False
+        self.rq=queue.Queue(maxsize=2)  # rendered PCM waiting to play
+        self.renderer=threading.Thread(target=self.render_loop, daemon=True)
         self.player=Player(); self.tmp=tempfile.gettempdir()
+        self.cache=OrderedDict()  # text -> rendered PCM; the grain is fixed per worker
     def enqueue(self, text):
         self.q.put(text)
-    def run(self):
-        while not self.stop:
+    def render(self, text):
+        pcm=self.cache.get(text)
+        if pcm is None:
+            pcm=render_line(text, self.grain, self.sr, self.cps, self.punct, self.ws)
+            self.cache[text]=pcm
+            if len(self.cache)>RENDER_CACHE: self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(text)
+        return pcm
+    def render_loop(self):
+        # runs ahead of playback: the next chunk renders while the current one plays
+        while True:
             item=self.q.get()
-            if item is None: break
-            samples = render_line(item, self.grain, self.sr, self.cps, self.punct, self.ws)
-            dur = self.player.play_async(samples, self.sr, self.tmp)
+            if item is None or self.stop: break
+            self.rq.put(self.render(item))
+        self.rq.put(None)
+    def run(self):
+        self.renderer.start()
+        cap=2*int(self.sr*BATCH_MS/1000); gap=bytes(2*int(self.sr*JOIN_MS/1000)); done=False
+        while not self.stop and not done:
+            pcm=self.rq.get()
+            if pcm is None: break
+            # backlog: join whatever is already rendered into one play (up to BATCH_MS)
+            while len(pcm)<cap:
+                try: nxt=self.rq.get_nowait()
+                except queue.Empty: break
+                if nxt is None: done=True; break
+                pcm=pcm+gap+nxt
+            dur = self.player.play_async(pcm, self.sr, self.tmp)
             self.player.wait_done(dur+0.03)
-            self.player.flush_silence(self.sr, FLUSH_MS)
-            if POST_GAP>0: time.sleep(POST_GAP)
+            if self.rq.empty():  # settle the device only when the stream has caught up
+                self.player.flush_silence(self.sr, FLUSH_MS)
+                if POST_GAP>0: time.sleep(POST_GAP)
+        self.player.close()
     def close(self):
         self.stop=True; self.q.put(None)
 
 # ---------- small UI ----------
 def pick_variation(vars):
     print("\nChoose a blip timbre:")
-    for i,(n,_,ms) in enumerate(vars,1):
+    for i,(n,ms) in enumerate(zip(vars.names,vars.ms),1):
         print(f" {i:2d}) {n:16s} ({int(ms)} ms)")
     s=input("Number [10=ut_default_blip]: ").strip() or "10"
     try:
         i=int(s); i=max(1,min(len(vars),i))
     except: i=10
-    return vars[i-1]
+    return i-1
 
 def cls(): os.system("cls" if os.name=="nt" else "clear")
 
 def main():
+    # Grains build in the background while the user is busy with the model/prompt prompts
+    pool = ThreadPoolExecutor(max_workers=1)
+    vars_f = pool.submit(build_vars, DEFAULT_AMP, DEFAULT_SR)
+
     # Greet & prompt text
     cls()
     print("BLIP + OLLAMA LIVE  (pick installed model -> stream with sound)\n")
@@ -275,8 +430,8 @@ def main():
     prompt_text = input("\nPrompt: ").strip() or "Describe an ancient forest in one paragraph."
 
     # Pick blip style
-    vars = build_vars(DEFAULT_AMP, DEFAULT_SR)
-    name, grain, _ = pick_variation(vars)
+    vars = vars_f.result(); pool.shutdown()
+    vi = pick_variation(vars); name, grain = vars.names[vi], vars.grain(vi)
     print(f"\nUsing model: {model}\nUsing variation: {name}\n")
 
     # Set up audio worker
@@ -305,7 +460,7 @@ def main():
             sys.stdout.write(chunk); sys.stdout.flush()
             bucket.append(chunk)
             now=time.monotonic()
-            if (now-last_t)*1000 >= COALESCE_MS or (bucket and any(c in PUNCT for c in bucket[-1])):
+            if (now-last_t)*1000 >= COALESCE_MS or (bucket and not PUNCT.isdisjoint(bucket[-1])):
                 flush_bucket()
         flush_bucket()
     except KeyboardInterrupt: